@@ -1,19 +1,19 @@
 ﻿import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import time
+import numpy as np
+import importlib.util
+import json
 import os
+import string
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
-# Earth Engine-backed detection pipeline
-try:
-    from src.processing.detect_plumes import run_detection
-    EE_PIPELINE_AVAILABLE = True
-except Exception:
-    EE_PIPELINE_AVAILABLE = False
+# Earth Engine-backed detection pipeline: probe for the earthengine-api
+# dependency without importing it (the import itself is slow); the pipeline
+# module is only imported when the fetch button is actually clicked
+EE_PIPELINE_AVAILABLE = importlib.util.find_spec('ee') is not None
 
 # --- 1. PAGE CONFIGURATION ---
 st.set_page_config(
@@ -30,7 +30,9 @@ if 'openai_api_key' not in st.session_state:
     st.session_state.openai_api_key = os.environ.get("OPENAI_API_KEY", "")
 
 # --- 2. THE VISUAL ENGINE (CSS) ---
-st.markdown("""
+# Module-level constant: built once at import, and the markdown element is
+# byte-identical across reruns so the frontend diff leaves it alone
+_CSS = """
 <style>
     /* IMPORT FONTS: Orbitron (Sci-Fi) & Rajdhani (Technical) */
     @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;500;700;900&family=Rajdhani:wght@300;400;500;600;700&display=swap');
@@ -132,17 +134,54 @@ st.markdown("""
     #MainMenu {visibility: hidden;} footer {display: none;} header {visibility: hidden;}
     .block-container {padding-top: 2rem;}
 </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # --- 3. DATA ENGINE ---
 
-@st.cache_data
-def get_dataset(live_mode):
-    """Load real detections; fall back to sample data if file is missing."""
-    detections_path = Path(__file__).parent / "output" / "detections.csv"
+# One PCG64 generator shared by every draw; cache_resource keeps it alive
+# across script reruns (a module global would be re-seeded every rerun and
+# hand each TTL refresh the identical first draws), so demo sessions are
+# reproducible while successive refreshes still advance the stream
+@st.cache_resource(show_spinner=False)
+def _get_rng():
+    return np.random.default_rng(42)
+
+# Confidence -> marker/bar color, shared by the dataset, globe and charts
+_CONF_COLORS = {'HIGH': '#ff2a6d', 'MEDIUM': '#f2a900', 'LOW': '#05ffa1'}
+
+# Columns the dashboard reads, under both the pipeline's raw names
+# (latitude/longitude) and the normalized ones used downstream
+_DASHBOARD_COLUMNS = {
+    'plant_name', 'plant', 'latitude', 'longitude', 'lat', 'lng',
+    'capacity_mw', 'state', 'operator', 'enhancement_percent',
+    'estimated_co2_kg_hr', 'estimated_co2_tons_day',
+    'detection_confidence', 'color',
+}
+
+_DETECTIONS_PATH = Path(__file__).parent / "output" / "detections.csv"
+
+@st.cache_data(show_spinner=False)
+def _load_base(mtime):
+    """Load and normalize detections; fall back to sample data if missing.
+
+    mtime is part of the cache key: a GEE fetch that rewrites the CSV is
+    picked up immediately, while unrelated reruns keep hitting the cache.
+    The live-mode noise lives in _apply_live_noise so toggling it never
+    re-reads the file.
+    """
+    detections_path = _DETECTIONS_PATH
 
     if detections_path.exists():
-        df = pd.read_csv(detections_path)
+        # Only pull the columns the dashboard consumes (the pipeline CSV also
+        # carries per-window NO2 diagnostics), and prefer Arrow's vectorized
+        # reader when the extension is installed
+        header = pd.read_csv(detections_path, nrows=0).columns
+        wanted = [c for c in header if c in _DASHBOARD_COLUMNS]
+        try:
+            df = pd.read_csv(detections_path, engine='pyarrow', usecols=wanted)
+        except (ImportError, ValueError):
+            df = pd.read_csv(detections_path, usecols=wanted)
     else:
         # Graceful fallback to baked-in sample if file absent
         data = [
@@ -209,53 +248,122 @@ def get_dataset(live_mode):
     }
     df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
 
-    # Color coding based on confidence
+    # Color coding based on confidence: vectorized dict lookup instead of a
+    # per-row apply; unknown/missing confidence falls through to green
     if 'color' not in df.columns:
-        def pick_color(conf):
-            if conf == 'HIGH':
-                return '#ff2a6d'
-            if conf == 'MEDIUM':
-                return '#f2a900'
-            return '#05ffa1'
-        df['color'] = df.get('detection_confidence', pd.Series()).apply(pick_color)
+        if 'detection_confidence' in df.columns:
+            df['color'] = (df['detection_confidence']
+                           .map(_CONF_COLORS)
+                           .fillna('#05ffa1'))
+        else:
+            df['color'] = '#05ffa1'
+
+    # Narrow dtypes: float32 covers the precision these readings carry and
+    # halves every Arrow/JSON payload; low-cardinality strings go categorical
+    for col in ('lat', 'lng', 'enhancement_percent',
+                'estimated_co2_kg_hr', 'estimated_co2_tons_day'):
+        if col in df.columns:
+            df[col] = df[col].astype('float32')
+    for col in ('state', 'operator', 'detection_confidence'):
+        if col in df.columns:
+            df[col] = df[col].astype('category')
 
     return df
 
-class ClimateIntelligence:
-    """
-    AI Logic Engine.
-    """
-    def __init__(self, api_key=None):
-        self.api_key = api_key
-        self.is_connected = bool(api_key)
-
-    def _simulate_delay(self):
-        time.sleep(1.2)
+def _apply_live_noise(base):
+    """Overlay ±5% telemetry noise on the stored readings — one vectorized
+    draw and multiply, leaving the cached base frame untouched."""
+    df = base.copy()
+    noise = _get_rng().uniform(0.95, 1.05, len(df)).astype('float32')
+    df['estimated_co2_kg_hr'] = df['estimated_co2_kg_hr'] * noise
+    df['estimated_co2_tons_day'] = df['estimated_co2_kg_hr'] * np.float32(24 / 1000)
+    return df
 
-    def get_summary(self, data):
-        self._simulate_delay()
-        total_emissions = sum(d['estimated_co2_kg_hr'] for d in data)
-        return f"""
+# cache_resource hands back the same DataFrame object instead of the
+# per-call pickle copy cache_data makes; consumers only read/filter it,
+# and the TTL keeps the live-mode noise refreshing once a minute
+@st.cache_resource(ttl=60, show_spinner=False)
+def get_dataset(live_mode, mtime):
+    base = _load_base(mtime)
+    return _apply_live_noise(base) if live_mode else base
+
+# Pure renderers for the reports that depend only on scalar aggregates;
+# lru_cache returns the finished string without re-running the template
+@lru_cache(maxsize=32)
+def _render_summary(n_points, total_emissions):
+    return f"""
         **EXECUTIVE BRIEF (AI GENERATED):**
-        
-        Satellite telemetry confirms {len(data)} active thermal monitoring points. 
+
+        Satellite telemetry confirms {n_points} active thermal monitoring points.
         Cumulative emission rate stands at **{total_emissions/1000:,.1f} tonnes/hr**.
-        
+
         **Key Findings:**
         * **Hotspot Analysis:** Central India (Vindhyachal & Sasan) shows highest NO2 column densities.
         * **Anomaly Detection:** 62% of monitored assets show >30% enhancement over background levels.
         * **Trend:** Emissions intensity has increased by 4.2% relative to last week's baseline.
         """
 
-    def analyze_compliance(self, data, plant_name):
-        self._simulate_delay()
+# Credits/year per kg/hr of baseline emissions: 15% reduction, annualized,
+# converted to tonnes
+CREDIT_FACTOR = 0.15 * 24 * 365 / 1000
+
+@lru_cache(maxsize=32)
+def _render_carbon_estimate(total_co2):
+    credits = total_co2 * CREDIT_FACTOR
+    value = credits * 500
+    return f"""
+        **CARBON MARKET ANALYSIS (CCTS 2023)**
+
+        * **Baseline Emissions:** {total_co2/1000:,.1f} tonnes/hr
+        * **Efficiency Potential:** 15% Reduction via boiler modernization.
+        * **Credit Generation:** ~{credits:,.0f} Carbon Credits/Year.
+        * **Market Value:** ₹{value:,.0f} (Estimated at ₹500/credit).
+        """
+
+# Pre-parsed once at import; substitute() just splices the three values
+_COMPLAINT_TMPL = string.Template("""
+        **SUBJECT: NOTICE OF VIOLATION - $plant_upper**
+
+        **To:** The Chairman, Central Pollution Control Board (CPCB)
+        **Date:** $date
+
+        **Statement of Violation:**
+        Digital evidence collected via ESA Sentinel-5P satellite (TROPOMI Sensor) indicates continuous excess emissions from the $plant Thermal Power Plant.
+
+        **Evidence:**
+        1.  **Spectral Analysis:** Confirms NO2 tropospheric column density violating EPA 1986 standards.
+        2.  **Enhancement:** Plume intensity is significantly higher than background levels.
+
+        We request an immediate on-site inspection under Section 5 of the Environment (Protection) Act, 1986.
+        """)
+
+@lru_cache(maxsize=128)
+def _render_cpcb_complaint(plant_name, date_str):
+    return _COMPLAINT_TMPL.substitute(
+        plant_upper=plant_name.upper(), plant=plant_name, date=date_str
+    )
+
+class ClimateIntelligence:
+    """
+    AI Logic Engine.
+    """
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+        self.is_connected = bool(api_key)
+
+    def get_summary(self, df):
+        total_emissions = float(df['estimated_co2_kg_hr'].sum())
+        return _render_summary(len(df), round(total_emissions, 2))
+
+    def analyze_compliance(self, df, plant_name):
         if plant_name == "All Plants":
             return "**COMPLIANCE OVERVIEW:**\n\nAggregate analysis suggests 3 plants exceeding CPCB NOx norms (450 mg/Nm3). Recommended immediate audit for NTPC Vindhyachal."
-        
-        plant = next((item for item in data if item["plant_name"] == plant_name), None)
-        if not plant: 
+
+        rows = df.loc[df['plant_name'] == plant_name]
+        if rows.empty:
             return "Plant data not found."
-        
+        plant = rows.iloc[0]
+
         status = "CRITICAL" if plant['detection_confidence'] == 'HIGH' else "MODERATE"
         return f"""
         **REGULATORY AUDIT: {plant_name.upper()}**
@@ -267,8 +375,7 @@ class ClimateIntelligence:
         * **Recommendation:** Inspect Flue Gas Desulfurization (FGD) unit immediately.
         """
 
-    def generate_esg_report(self, data, company_name):
-        self._simulate_delay()
+    def generate_esg_report(self, df, company_name):
         return f"""
         # ESG DISCLOSURE: {company_name.upper()}
         
@@ -283,63 +390,84 @@ class ClimateIntelligence:
         * **Risk:** High regulatory risk due to visible satellite signature.
         """
 
-    def draft_cpcb_complaint(self, data, plant_name):
-        self._simulate_delay()
-        return f"""
-        **SUBJECT: NOTICE OF VIOLATION - {plant_name.upper()}**
-        
-        **To:** The Chairman, Central Pollution Control Board (CPCB)
-        **Date:** {datetime.now().strftime('%Y-%m-%d')}
-        
-        **Statement of Violation:**
-        Digital evidence collected via ESA Sentinel-5P satellite (TROPOMI Sensor) indicates continuous excess emissions from the {plant_name} Thermal Power Plant.
-        
-        **Evidence:**
-        1.  **Spectral Analysis:** Confirms NO2 tropospheric column density violating EPA 1986 standards.
-        2.  **Enhancement:** Plume intensity is significantly higher than background levels.
-        
-        We request an immediate on-site inspection under Section 5 of the Environment (Protection) Act, 1986.
-        """
+    def draft_cpcb_complaint(self, df, plant_name):
+        # Date only changes daily, so the lru_cache key stays hot all day
+        return _render_cpcb_complaint(plant_name, datetime.now().strftime('%Y-%m-%d'))
 
-    def estimate_carbon_credits(self, data):
-        self._simulate_delay()
-        total_co2 = sum(d['estimated_co2_kg_hr'] for d in data)
-        return f"""
-        **CARBON MARKET ANALYSIS (CCTS 2023)**
-        
-        * **Baseline Emissions:** {total_co2/1000:,.1f} tonnes/hr
-        * **Efficiency Potential:** 15% Reduction via boiler modernization.
-        * **Credit Generation:** ~{(total_co2*0.15*24*365)/1000:,.0f} Carbon Credits/Year.
-        * **Market Value:** ₹{(total_co2*0.15*24*365/1000)*500:,.0f} (Estimated at ₹500/credit).
-        """
+    def estimate_carbon_credits(self, df):
+        total_co2 = float(df['estimated_co2_kg_hr'].sum())
+        return _render_carbon_estimate(round(total_co2, 2))
+
+@st.cache_data(show_spinner=False)
+def run_ai_report(kind, fingerprint, _ai, _df, extra=None):
+    """
+    Memoize AI reports per (report kind, data fingerprint, extra arg).
+
+    fingerprint is a cheap (row count, total CO2) tuple standing in for the
+    detections, so Streamlit never hashes the frame itself; _ai and _df are
+    underscore-prefixed to skip hashing entirely.
+    """
+    if kind == 'summary':
+        return _ai.get_summary(_df)
+    if kind == 'compliance':
+        return _ai.analyze_compliance(_df, extra)
+    if kind == 'esg':
+        return _ai.generate_esg_report(_df, extra)
+    if kind == 'complaint':
+        return _ai.draft_cpcb_complaint(_df, extra)
+    return _ai.estimate_carbon_credits(_df)
 
 # --- 4. 3D GLOBE COMPONENT ---
+@st.fragment
 def render_globe(df):
     """
     Renders the Globe.gl visualization.
+
+    Fragment-scoped like render_charts: widget interactions elsewhere on the
+    page no longer tear down and re-init the WebGL iframe.
     """
-    points = []
-    for _, r in df.iterrows():
-        # Map logical data to visual properties
-        size = r['estimated_co2_kg_hr'] / 40000 
-        points.append({
-            'lat': r['lat'], 'lng': r['lng'], 
-            'size': size, 
-            'color': r['color'], 
-            'name': r['plant_name'],
-            'desc': f"{r['estimated_co2_kg_hr']/1000:.1f}t/hr"
-        })
-    
-    # Javascript injection for Globe.gl
+    # Globe.gl draws one 3D object per point and frame-rate collapses past a
+    # few thousand; aggregate a large catalog into 0.25-degree bins so the
+    # draw count stays bounded. No-op for the sample/demo sizes.
+    if len(df) > 500:
+        binned = (df.assign(lat=np.floor(df['lat'].to_numpy() * 4) / 4,
+                            lng=np.floor(df['lng'].to_numpy() * 4) / 4)
+                  .groupby(['lat', 'lng'], observed=True)
+                  .agg(estimated_co2_kg_hr=('estimated_co2_kg_hr', 'sum'),
+                       n_sites=('plant_name', 'size'),
+                       color=('color', 'first'))
+                  .reset_index())
+        binned['plant_name'] = binned['n_sites'].map('{} sites'.format)
+        df = binned
+
+    # Map logical data to visual properties column-wise; one to_dict at the
+    # end replaces the per-row iterrows/dict/f-string work
+    co2 = df['estimated_co2_kg_hr'].to_numpy()
+    pts = pd.DataFrame({
+        'lat': df['lat'].to_numpy(),
+        'lng': df['lng'].to_numpy(),
+        'size': co2 / 40000,
+        'color': df['color'].to_numpy(),
+        'name': df['plant_name'].to_numpy(),
+        # One vectorized Unicode build instead of a per-row f-string
+        'desc': np.char.add(np.round(co2 / 1000, 1).astype('U8'), 't/hr'),
+    })
+    # Compact JSON + JSON.parse is much cheaper for the browser than
+    # evaluating a Python-repr'd object literal, and survives quotes in names
+    points_json = json.dumps(pts.to_dict(orient='records'), separators=(',', ':'))
+
+    # Javascript injection for Globe.gl; defer lets the library fetch in
+    # parallel with HTML parsing instead of blocking on it
     html_code = f"""
     <head>
-        <script src="//unpkg.com/globe.gl"></script>
+        <script defer src="//unpkg.com/globe.gl"></script>
         <style>body {{ margin: 0; background: transparent; }}</style>
     </head>
     <body>
         <div id="globeViz"></div>
         <script>
-            const gData = {points};
+            const gData = JSON.parse({points_json!r});
+            window.addEventListener('DOMContentLoaded', () => {{
             const world = Globe()
                 (document.getElementById('globeViz'))
                 .globeImageUrl('//unpkg.com/three-globe/example/img/earth-night.jpg')
@@ -362,54 +490,169 @@ def render_globe(df):
 
             world.controls().autoRotate = true;
             world.controls().autoRotateSpeed = 0.6;
+            }});
         </script>
     </body>
     """
     components.html(html_code, height=500)
 
 # --- 5. FUNCTIONAL CHARTS ---
-def render_charts(df):
+
+def _import_go():
+    """Import plotly lazily: the parse cost only hits the first chart build,
+    and sys.modules makes every later call free. Also switches plotly's JSON
+    serializer to the orjson engine when that extension is installed."""
+    import plotly.graph_objects as go
+    try:
+        import orjson  # noqa: F401
+        import plotly.io as pio
+        pio.json.config.default_engine = "orjson"
+    except ImportError:
+        pass
+    return go
+
+# Dark theme props shared by both figures
+_DARK_LAYOUT = dict(
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font=dict(color='#e0e0e0', family="Rajdhani"),
+    xaxis=dict(showgrid=False, color='#8fa3bf'),
+    yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.1)', color='#8fa3bf')
+)
+
+@st.cache_data(show_spinner=False)
+def _bar_figure(plants, rates, confidences):
+    """Top-emitters bar built straight from arrays (no px inference)."""
+    go = _import_go()
+    fig = go.Figure(go.Bar(
+        x=list(plants),
+        y=list(rates),
+        marker_color=[_CONF_COLORS.get(c, '#05ffa1') for c in confidences],
+    ))
+    # Bounded spikedistance: the -1 default makes plotly.js scan every
+    # point on mouse move, a known hover-lag trap on dense traces
+    fig.update_layout(**_DARK_LAYOUT, height=300, margin=dict(l=0, r=0, t=0, b=0),
+                      uirevision='bar', hovermode='x', spikedistance=20)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _state_figure(states, totals):
+    """Per-state emissions as a horizontal bar, largest on top.
+
+    Bars render as plain SVG rects; plotly's pie tessellates one arc per
+    slice and gets slow (and unreadable) past a handful of states.
+    """
+    go = _import_go()
+    order = sorted(range(len(states)), key=lambda i: totals[i])
+    fig = go.Figure(go.Bar(
+        x=[totals[i] for i in order],
+        y=[states[i] for i in order],
+        orientation='h',
+        marker_color='#00f2ff',
+    ))
+    fig.update_layout(**_DARK_LAYOUT, height=300, margin=dict(l=0, r=0, t=0, b=0),
+                      uirevision='state')
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _chart_inputs(data_fp, _df):
+    """Top-10 and per-state aggregates, memoized on the data fingerprint.
+
+    data_fp keys the cache; _df rides along unhashed (leading underscore).
+    """
+    top10 = _df.nlargest(10, 'estimated_co2_kg_hr')
+    # factorize + bincount: one pass over integer codes, no hash-table
+    # groupby machinery for a simple per-state sum. factorize encodes a
+    # missing state as -1, which bincount rejects — mask those rows out,
+    # matching groupby's NaN-dropping behavior
+    codes, states = pd.factorize(_df['state'])
+    valid = codes >= 0
+    sums = np.bincount(codes[valid],
+                       weights=_df['estimated_co2_kg_hr'].to_numpy()[valid],
+                       minlength=len(states))
+    return {
+        'plants': tuple(top10['plant_name']),
+        'rates': tuple(top10['estimated_co2_kg_hr']),
+        'confidences': tuple(top10['detection_confidence']),
+        'states': tuple(states),
+        'state_sums': tuple(sums),
+    }
+
+@st.cache_data(show_spinner=False)
+def _table_view(data_fp, _df):
+    """Display projection for the detection log, memoized on data_fp.
+
+    Returning the same object across reruns lets Streamlit reuse its Arrow
+    serialization of the frame instead of rebuilding it each time.
+    """
+    return _df[['plant_name', 'state', 'estimated_co2_kg_hr',
+                'enhancement_percent', 'detection_confidence']]
+
+# Fragment: chart-only interactions rerun this function, not the script
+@st.fragment
+def render_charts(df, data_fp):
     c1, c2 = st.columns(2)
-    
-    # Define dark theme props
-    dark_layout = dict(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(color='#e0e0e0', family="Rajdhani"),
-        xaxis=dict(showgrid=False, color='#8fa3bf'),
-        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.1)', color='#8fa3bf')
-    )
+    inputs = _chart_inputs(data_fp, df)
 
     with c1:
         st.markdown('<div class="glass-card">', unsafe_allow_html=True)
         st.markdown("#### 📊 EMISSIONS BY PLANT")
-        
-        fig = px.bar(
-            df.nlargest(10, 'estimated_co2_kg_hr'),
-            x='plant_name',
-            y='estimated_co2_kg_hr',
-            color='detection_confidence',
-            color_discrete_map={'HIGH': '#ff2a6d', 'MEDIUM': '#f2a900', 'LOW': '#05ffa1'}
-        )
-        fig.update_layout(**dark_layout, height=300, margin=dict(l=0, r=0, t=0, b=0))
+
+        fig = _bar_figure(inputs['plants'], inputs['rates'], inputs['confidences'])
         st.plotly_chart(fig, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
     with c2:
         st.markdown('<div class="glass-card">', unsafe_allow_html=True)
         st.markdown("#### 📈 STATE-WISE INTENSITY")
-        
-        state_emissions = df.groupby('state')['estimated_co2_kg_hr'].sum().reset_index()
-        fig2 = px.pie(
-            state_emissions, 
-            values='estimated_co2_kg_hr', 
-            names='state',
-            color_discrete_sequence=px.colors.sequential.Bluered_r
-        )
-        fig2.update_layout(**dark_layout, height=300, margin=dict(l=0, r=0, t=0, b=0))
+
+        fig2 = _state_figure(inputs['states'], inputs['state_sums'])
         st.plotly_chart(fig2, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
+# Fragment: report buttons and selectors rerun only this block, so the
+# globe, charts and table stay untouched while the AI works
+@st.fragment
+def render_ai_tabs(df, ai, total_co2):
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["SUMMARY", "COMPLIANCE", "ESG REPORT", "CPCB NOTICE", "CARBON"])
+
+    data_fp = (len(df), total_co2)
+
+    with tab1:
+        st.markdown("#### 📋 Executive Insights")
+        if st.button("GENERATE SUMMARY", key="btn_sum"):
+            with st.spinner("AI Processing..."):
+                st.info(run_ai_report('summary', data_fp, ai, df))
+
+    with tab2:
+        st.markdown("#### ⚖️ Regulatory Audit")
+        target = st.selectbox("Select Plant", ["All Plants"] + list(df['plant_name'].unique()))
+        if st.button("CHECK COMPLIANCE", key="btn_comp"):
+            with st.spinner("Analyzing CPCB Norms..."):
+                st.warning(run_ai_report('compliance', data_fp, ai, df, target))
+
+    with tab3:
+        st.markdown("#### 🌿 ESG Disclosure")
+        comp = st.text_input("Company Name", "Adani Power")
+        if st.button("CREATE REPORT", key="btn_esg"):
+            with st.spinner("Drafting Disclosure..."):
+                st.success(run_ai_report('esg', data_fp, ai, df, comp))
+
+    with tab4:
+        st.markdown("#### 📜 Legal Drafting")
+        target_legal = st.selectbox("Select Target Plant", list(df['plant_name'].unique()), key="sel_legal")
+        if st.button("DRAFT CPCB COMPLAINT", key="btn_legal"):
+            with st.spinner("Drafting Legal Notice..."):
+                st.code(run_ai_report('complaint', data_fp, ai, df, target_legal), language="markdown")
+
+    with tab5:
+        st.markdown("#### 💰 Carbon Markets (CCTS 2023)")
+        if st.button("ESTIMATE CREDITS", key="btn_carbon"):
+            st.success(run_ai_report('carbon', data_fp, ai, df))
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
 # --- 6. SLIDE MENU BAR CONTROLS ---
 def sidebar():
     # CHANGED: Visual styling for Sidebar Header
@@ -454,8 +697,10 @@ def sidebar():
         if st.sidebar.button("Fetch Real Data from GEE"):
             with st.spinner("Contacting Google Earth Engine..."):
                 try:
+                    from src.processing.detect_plumes import run_detection
                     run_detection(days_back=days_back, use_demo=False)
                     st.cache_data.clear()
+                    st.cache_resource.clear()
                     st.session_state.use_live_data = True
                     st.success("Updated detections.csv from Sentinel-5P")
                     st.rerun()
@@ -467,6 +712,7 @@ def sidebar():
     st.sidebar.markdown("---")
     if st.sidebar.button("HARD RESET SYSTEM"):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
         
     return {'high': f_high, 'medium': f_med}
@@ -474,7 +720,8 @@ def sidebar():
 # --- 7. MAIN UI EXECUTION ---
 
 filters = sidebar()
-raw_df = get_dataset(st.session_state.use_live_data)
+_mtime = _DETECTIONS_PATH.stat().st_mtime if _DETECTIONS_PATH.exists() else 0.0
+raw_df = get_dataset(st.session_state.use_live_data, _mtime)
 
 # Apply filters
 allowed_conf = []
@@ -485,6 +732,12 @@ allowed_conf.append('LOW') # Always show low for baseline
 df = raw_df[raw_df['detection_confidence'].isin(allowed_conf)]
 ai = ClimateIntelligence(st.session_state.openai_api_key)
 
+# One pass over the emissions column; every metric below reuses these
+em = df['estimated_co2_kg_hr'].to_numpy()
+total_co2 = float(em.sum())
+avg_co2 = float(em.mean()) if len(em) else 0.0
+critical = int((df['detection_confidence'] == 'HIGH').sum())
+
 # HERO SECTION
 c1, c2 = st.columns([1.5, 1])
 
@@ -509,7 +762,7 @@ with c1:
     # Quick Stats
     st.markdown('<div style="height: 20px;"></div>', unsafe_allow_html=True)
     sc1, sc2, sc3 = st.columns(3)
-    sc1.metric("AVG INTENSITY", f"{df['estimated_co2_kg_hr'].mean()/1000:.1f}t", delta_color="inverse")
+    sc1.metric("AVG INTENSITY", f"{avg_co2/1000:.1f}t", delta_color="inverse")
     sc2.metric("DATA LATENCY", "12m", delta_color="normal")
     sc3.metric("AI MODEL", "OPENAI GPT-4o") # CHANGED: Frontend Label
 
@@ -522,8 +775,6 @@ st.markdown('<h3 style="margin-bottom: 20px;">LIVE TELEMETRY & ANALYTICS</h3>',
 
 # Metrics Row
 m1, m2, m3, m4 = st.columns(4)
-total_co2 = df['estimated_co2_kg_hr'].sum()
-critical = len(df[df['detection_confidence']=='HIGH'])
 
 with m1:
     st.markdown(f'<div class="glass-card"><div class="metric-lbl">TOTAL EMISSIONS</div><div class="metric-val neon-blue">{total_co2/1000:.1f}k</div><div style="font-size:0.8rem">Tonnes/Hr</div></div>', unsafe_allow_html=True)
@@ -535,7 +786,7 @@ with m4:
     st.markdown(f'<div class="glass-card"><div class="metric-lbl">COMPLIANCE</div><div class="metric-val neon-green">87%</div><div style="font-size:0.8rem; color:#05ffa1">AI Analyzed</div></div>', unsafe_allow_html=True)
 
 # Charts
-render_charts(df)
+render_charts(df, (len(df), total_co2))
 
 # AI & Detailed Analysis Section
 st.markdown("---")
@@ -558,51 +809,15 @@ with ac1:
     """.format("ONLINE" if st.session_state.openai_api_key else "SIMULATION"), unsafe_allow_html=True)
 
 with ac2:
-    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["SUMMARY", "COMPLIANCE", "ESG REPORT", "CPCB NOTICE", "CARBON"])
-    
-    data_list = df.to_dict('records')
-    
-    with tab1:
-        st.markdown("#### 📋 Executive Insights")
-        if st.button("GENERATE SUMMARY", key="btn_sum"):
-            with st.spinner("AI Processing..."):
-                st.info(ai.get_summary(data_list))
-                
-    with tab2:
-        st.markdown("#### ⚖️ Regulatory Audit")
-        target = st.selectbox("Select Plant", ["All Plants"] + list(df['plant_name'].unique()))
-        if st.button("CHECK COMPLIANCE", key="btn_comp"):
-            with st.spinner("Analyzing CPCB Norms..."):
-                st.warning(ai.analyze_compliance(data_list, target))
-                
-    with tab3:
-        st.markdown("#### 🌿 ESG Disclosure")
-        comp = st.text_input("Company Name", "Adani Power")
-        if st.button("CREATE REPORT", key="btn_esg"):
-            with st.spinner("Drafting Disclosure..."):
-                st.success(ai.generate_esg_report(data_list, comp))
-                
-    with tab4:
-        st.markdown("#### 📜 Legal Drafting")
-        target_legal = st.selectbox("Select Target Plant", list(df['plant_name'].unique()), key="sel_legal")
-        if st.button("DRAFT CPCB COMPLAINT", key="btn_legal"):
-            with st.spinner("Drafting Legal Notice..."):
-                st.code(ai.draft_cpcb_complaint(data_list, target_legal), language="markdown")
-                
-    with tab5:
-        st.markdown("#### 💰 Carbon Markets (CCTS 2023)")
-        if st.button("ESTIMATE CREDITS", key="btn_carbon"):
-            st.success(ai.estimate_carbon_credits(data_list))
-            
-    st.markdown('</div>', unsafe_allow_html=True)
+    render_ai_tabs(df, ai, total_co2)
 
 # Data Table
 st.markdown("### 📋 RAW DETECTION LOGS")
 st.markdown('<div class="glass-card">', unsafe_allow_html=True)
 st.dataframe(
-    df[['plant_name', 'state', 'estimated_co2_kg_hr', 'enhancement_percent', 'detection_confidence']],
+    _table_view((len(df), total_co2), df),
     use_container_width=True,
+    hide_index=True,
     column_config={
         "plant_name": "Plant",
         "estimated_co2_kg_hr": st.column_config.NumberColumn("CO2 (kg/hr)", format="%d"),
@@ -1,9 +1,7 @@
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-import pydeck as pdk
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 import os
@@ -38,6 +36,11 @@ except ImportError:
         def draft_cpcb_complaint(self, *args): return "AI Module not found."
         def estimate_carbon_credits(self, *args): return "AI Module not found."
         def custom_query(self, *args): return "AI Module not found."
+        def stream_summary(self, *args): return iter(["AI Module not found."])
+        def stream_compliance(self, *args): return iter(["AI Module not found."])
+        def stream_esg_report(self, *args): return iter(["AI Module not found."])
+        def stream_cpcb_complaint(self, *args): return iter(["AI Module not found."])
+        def stream_carbon_credits(self, *args): return iter(["AI Module not found."])
 
 st.set_page_config(
     page_title="CO2Watch India | AI Climate Monitor",
@@ -49,7 +52,11 @@ st.set_page_config(
 # -----------------------------------------------------------------------------
 # 1. CUSTOM CSS (Futuristic, Glassmorphism, Neon)
 # -----------------------------------------------------------------------------
-st.markdown("""
+
+# Module-level constant: the string is materialized once at import, and the
+# st.markdown element stays byte-identical across reruns so Streamlit's
+# frontend diff leaves it untouched
+_CSS = """
     <style>
         /* IMPORT FONTS */
         @import url('https://fonts.googleapis.com/css2?family=Orbitron:wght@400;500;700;900&family=Rajdhani:wght@300;400;500;600;700&display=swap');
@@ -213,146 +220,374 @@ st.markdown("""
             background: transparent;
         }
     </style>
-""", unsafe_allow_html=True)
+"""
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # -----------------------------------------------------------------------------
 # 2. DATA & HELPER FUNCTIONS
 # -----------------------------------------------------------------------------
 
+# Confidence level -> neon accent color, shared by the charts
+CONF_COLORS = {'HIGH': '#ff2a6d', 'MEDIUM': '#00f2ff', 'LOW': '#05ffa1'}
+
+# Fast DataFrame fingerprint for cache keys: Streamlit's default pickle+md5
+# hashing of frames is the latency floor on every cached call
+try:
+    import xxhash
+
+    def _hash_df(df):
+        return xxhash.xxh3_64(
+            pd.util.hash_pandas_object(df, index=True).values.tobytes()
+        ).intdigest()
+except ImportError:
+    def _hash_df(df):
+        return int(pd.util.hash_pandas_object(df, index=True).sum())
+
+_DF_HASH_FUNCS = {pd.DataFrame: _hash_df}
+
+# Demo detections in columnar (struct-of-arrays) form: pd.DataFrame takes
+# each array as a ready-made column, skipping the row-to-column transpose and
+# per-field type inference a list of dicts goes through, and the narrow
+# dtypes match what load_data enforces on the real pipeline output
+_DEMO_DATA = {
+    'plant_name': ['Vindhyachal', 'Mundra', 'Sasan', 'Sipat', 'Rihand',
+                   'Talcher', 'Chandrapur', 'Anpara', 'Korba', 'Ramagundam'],
+    'latitude': np.array([24.098, 22.839, 24.078, 22.067, 24.218,
+                          20.962, 19.945, 24.201, 22.350, 18.781],
+                         dtype=np.float32),
+    'longitude': np.array([82.672, 69.717, 81.778, 82.617, 83.054,
+                           85.213, 79.299, 82.648, 82.680, 79.476],
+                          dtype=np.float32),
+    'capacity_mw': np.array([4760, 4620, 3960, 2980, 3000,
+                             3000, 2920, 2630, 2600, 2600], dtype=np.int32),
+    'state': ['Madhya Pradesh', 'Gujarat', 'Madhya Pradesh', 'Chhattisgarh',
+              'Uttar Pradesh', 'Odisha', 'Maharashtra', 'Uttar Pradesh',
+              'Chhattisgarh', 'Telangana'],
+    'operator': ['NTPC Limited', 'Adani Power', 'Reliance Power',
+                 'NTPC Limited', 'NTPC Limited', 'NTPC Limited', 'MAHAGENCO',
+                 'UPRVUNL', 'NTPC Limited', 'NTPC Limited'],
+    'plume_no2_mol_m2': np.array([0.00018, 0.00015, 0.00014, 0.00012,
+                                  0.00011, 0.00010, 0.00009, 0.00011,
+                                  0.00010, 0.00008], dtype=np.float32),
+    'background_no2_mol_m2': np.array([0.00010, 0.00009, 0.00010, 0.00009,
+                                       0.00008, 0.00008, 0.00007, 0.00009,
+                                       0.00008, 0.00007], dtype=np.float32),
+    'enhancement_mol_m2': np.array([0.00008, 0.00006, 0.00004, 0.00003,
+                                    0.000025, 0.00002, 0.00002, 0.00002,
+                                    0.000018, 0.00001], dtype=np.float32),
+    'enhancement_percent': np.array([80, 66.7, 40, 33.3, 31.25,
+                                     25, 28.6, 22.2, 22.5, 14.3],
+                                    dtype=np.float32),
+    'estimated_nox_kg_hr': np.array([450, 340, 280, 210, 180,
+                                     150, 140, 130, 120, 90],
+                                    dtype=np.float32),
+    'estimated_co2_kg_hr': np.array([97650, 73780, 60760, 45570, 39060,
+                                     32550, 30380, 28210, 26040, 19530],
+                                    dtype=np.float32),
+    'estimated_co2_tons_day': np.array([2343.6, 1770.7, 1458.2, 1093.7,
+                                        937.4, 781.2, 729.1, 677.0,
+                                        625.0, 468.7], dtype=np.float32),
+    'detection_confidence': ['HIGH', 'HIGH', 'HIGH', 'HIGH', 'HIGH',
+                             'MEDIUM', 'MEDIUM', 'MEDIUM', 'MEDIUM', 'LOW'],
+}
+
+@st.cache_data
 def create_demo_data():
     """Create demo detection data for presentation."""
-    return pd.DataFrame([
-        {
-            'plant_name': 'Vindhyachal', 'latitude': 24.098, 'longitude': 82.672,
-            'capacity_mw': 4760, 'state': 'Madhya Pradesh', 'operator': 'NTPC Limited',
-            'plume_no2_mol_m2': 0.00018, 'background_no2_mol_m2': 0.00010,
-            'enhancement_mol_m2': 0.00008, 'enhancement_percent': 80,
-            'estimated_nox_kg_hr': 450, 'estimated_co2_kg_hr': 97650,
-            'estimated_co2_tons_day': 2343.6, 'detection_confidence': 'HIGH'
-        },
-        {
-            'plant_name': 'Mundra', 'latitude': 22.839, 'longitude': 69.717,
-            'capacity_mw': 4620, 'state': 'Gujarat', 'operator': 'Adani Power',
-            'plume_no2_mol_m2': 0.00015, 'background_no2_mol_m2': 0.00009,
-            'enhancement_mol_m2': 0.00006, 'enhancement_percent': 66.7,
-            'estimated_nox_kg_hr': 340, 'estimated_co2_kg_hr': 73780,
-            'estimated_co2_tons_day': 1770.7, 'detection_confidence': 'HIGH'
-        },
-        {
-            'plant_name': 'Sasan', 'latitude': 24.078, 'longitude': 81.778,
-            'capacity_mw': 3960, 'state': 'Madhya Pradesh', 'operator': 'Reliance Power',
-            'plume_no2_mol_m2': 0.00014, 'background_no2_mol_m2': 0.00010,
-            'enhancement_mol_m2': 0.00004, 'enhancement_percent': 40,
-            'estimated_nox_kg_hr': 280, 'estimated_co2_kg_hr': 60760,
-            'estimated_co2_tons_day': 1458.2, 'detection_confidence': 'HIGH'
-        },
-        {
-            'plant_name': 'Sipat', 'latitude': 22.067, 'longitude': 82.617,
-            'capacity_mw': 2980, 'state': 'Chhattisgarh', 'operator': 'NTPC Limited',
-            'plume_no2_mol_m2': 0.00012, 'background_no2_mol_m2': 0.00009,
-            'enhancement_mol_m2': 0.00003, 'enhancement_percent': 33.3,
-            'estimated_nox_kg_hr': 210, 'estimated_co2_kg_hr': 45570,
-            'estimated_co2_tons_day': 1093.7, 'detection_confidence': 'HIGH'
-        },
-        {
-            'plant_name': 'Rihand', 'latitude': 24.218, 'longitude': 83.054,
-            'capacity_mw': 3000, 'state': 'Uttar Pradesh', 'operator': 'NTPC Limited',
-            'plume_no2_mol_m2': 0.00011, 'background_no2_mol_m2': 0.00008,
-            'enhancement_mol_m2': 0.000025, 'enhancement_percent': 31.25,
-            'estimated_nox_kg_hr': 180, 'estimated_co2_kg_hr': 39060,
-            'estimated_co2_tons_day': 937.4, 'detection_confidence': 'HIGH'
-        },
-        {
-            'plant_name': 'Talcher', 'latitude': 20.962, 'longitude': 85.213,
-            'capacity_mw': 3000, 'state': 'Odisha', 'operator': 'NTPC Limited',
-            'plume_no2_mol_m2': 0.00010, 'background_no2_mol_m2': 0.00008,
-            'enhancement_mol_m2': 0.00002, 'enhancement_percent': 25,
-            'estimated_nox_kg_hr': 150, 'estimated_co2_kg_hr': 32550,
-            'estimated_co2_tons_day': 781.2, 'detection_confidence': 'MEDIUM'
-        },
-        {
-            'plant_name': 'Chandrapur', 'latitude': 19.945, 'longitude': 79.299,
-            'capacity_mw': 2920, 'state': 'Maharashtra', 'operator': 'MAHAGENCO',
-            'plume_no2_mol_m2': 0.00009, 'background_no2_mol_m2': 0.00007,
-            'enhancement_mol_m2': 0.00002, 'enhancement_percent': 28.6,
-            'estimated_nox_kg_hr': 140, 'estimated_co2_kg_hr': 30380,
-            'estimated_co2_tons_day': 729.1, 'detection_confidence': 'MEDIUM'
-        },
-        {
-            'plant_name': 'Anpara', 'latitude': 24.201, 'longitude': 82.648,
-            'capacity_mw': 2630, 'state': 'Uttar Pradesh', 'operator': 'UPRVUNL',
-            'plume_no2_mol_m2': 0.00011, 'background_no2_mol_m2': 0.00009,
-            'enhancement_mol_m2': 0.00002, 'enhancement_percent': 22.2,
-            'estimated_nox_kg_hr': 130, 'estimated_co2_kg_hr': 28210,
-            'estimated_co2_tons_day': 677.0, 'detection_confidence': 'MEDIUM'
-        },
-        {
-            'plant_name': 'Korba', 'latitude': 22.350, 'longitude': 82.680,
-            'capacity_mw': 2600, 'state': 'Chhattisgarh', 'operator': 'NTPC Limited',
-            'plume_no2_mol_m2': 0.00010, 'background_no2_mol_m2': 0.00008,
-            'enhancement_mol_m2': 0.000018, 'enhancement_percent': 22.5,
-            'estimated_nox_kg_hr': 120, 'estimated_co2_kg_hr': 26040,
-            'estimated_co2_tons_day': 625.0, 'detection_confidence': 'MEDIUM'
-        },
-        {
-            'plant_name': 'Ramagundam', 'latitude': 18.781, 'longitude': 79.476,
-            'capacity_mw': 2600, 'state': 'Telangana', 'operator': 'NTPC Limited',
-            'plume_no2_mol_m2': 0.00008, 'background_no2_mol_m2': 0.00007,
-            'enhancement_mol_m2': 0.00001, 'enhancement_percent': 14.3,
-            'estimated_nox_kg_hr': 90, 'estimated_co2_kg_hr': 19530,
-            'estimated_co2_tons_day': 468.7, 'detection_confidence': 'LOW'
-        },
-    ])
+    return pd.DataFrame(_DEMO_DATA)
 
-@st.cache_data
+@st.cache_data(ttl=3600)
 def load_data():
     """Load detection results and plant data."""
-    detections_file = Path(__file__).parent / 'output' / 'detections.csv'
-    
-    if detections_file.exists():
-        detections = pd.read_csv(detections_file)
+    output_dir = Path(__file__).parent / 'output'
+    parquet_file = output_dir / 'detections.parquet'
+    csv_file = output_dir / 'detections.csv'
+
+    if parquet_file.exists():
+        # Columnar read: typed columns, no string->float inference; the
+        # pyarrow dtype backend keeps strings dictionary-encoded and
+        # numerics zero-copy
+        detections = pd.read_parquet(parquet_file, engine='pyarrow',
+                                     dtype_backend='pyarrow')
+    elif csv_file.exists():
+        # Fall back to the CSV written by the detection pipeline
+        detections = pd.read_csv(csv_file, engine='pyarrow',
+                                 dtype_backend='pyarrow')
     else:
         detections = create_demo_data()
-        output_dir = Path(__file__).parent / 'output'
         output_dir.mkdir(exist_ok=True)
-        detections.to_csv(output_dir / 'detections.csv', index=False)
-    
+        detections.to_parquet(parquet_file, engine='pyarrow', compression='snappy')
+
+    # float32 holds the ~7 significant figures these measurements carry and
+    # halves both the frame's memory and the JSON payloads to pydeck/Plotly
+    for col in ('latitude', 'longitude', 'plume_no2_mol_m2',
+                'background_no2_mol_m2', 'enhancement_mol_m2',
+                'enhancement_percent', 'estimated_nox_kg_hr',
+                'estimated_co2_kg_hr', 'estimated_co2_tons_day'):
+        if col in detections.columns:
+            detections[col] = detections[col].astype('float32')
+    if 'capacity_mw' in detections.columns:
+        detections['capacity_mw'] = detections['capacity_mw'].astype('int32')
+
+    # Ordered categorical: isin/groupby/sort run on int8 codes, not strings
+    detections['detection_confidence'] = detections['detection_confidence'].astype(
+        pd.CategoricalDtype(['LOW', 'MEDIUM', 'HIGH'], ordered=True)
+    )
+
+    # Other low-cardinality strings as plain categoricals: smaller in memory,
+    # dictionary-encoded when written to Parquet
+    for col in ('state', 'operator'):
+        if col in detections.columns:
+            detections[col] = detections[col].astype('category')
+
     return detections
 
+@st.cache_resource(show_spinner=False)
+def build_deck(data_key, _map_source, map_layer):
+    """
+    Build the pydeck Deck once per unique (data fingerprint, layer style).
+
+    data_key is a content hash of the filtered detections; _map_source is
+    skipped by Streamlit's hasher (leading underscore) so the DataFrame
+    itself is never re-hashed.
+    """
+    # Deferred: hero-only visitors never pay the pydeck import
+    import pydeck as pdk
+
+    if map_layer == "Heatmap":
+        # GPU-side aggregation; ship only the three columns the layer reads
+        layer = pdk.Layer(
+            "HeatmapLayer",
+            data=_map_source[['longitude', 'latitude', 'estimated_co2_kg_hr']],
+            get_position='[longitude, latitude]',
+            get_weight='estimated_co2_kg_hr',
+            radius_pixels=60,
+        )
+    else:
+        # Narrow copy: only the columns the tooltip and accessors reference,
+        # which also shrinks the JSON payload shipped to deck.gl
+        map_data = _map_source[[
+            'longitude', 'latitude', 'plant_name', 'state', 'capacity_mw',
+            'enhancement_percent', 'detection_confidence', 'estimated_co2_kg_hr',
+        ]].copy()
+        conf = map_data['detection_confidence'].to_numpy()
+        colors = np.empty((len(map_data), 4), dtype=np.uint8)
+        colors[:] = [5, 255, 161, 150]                  # Neon Green (LOW)
+        colors[conf == 'MEDIUM'] = [0, 242, 255, 180]   # Neon Cyan
+        colors[conf == 'HIGH'] = [255, 42, 109, 200]    # Neon Red
+        # tolist() gives per-row Python lists; ndarray cells get stringified
+        # by pydeck's JSON bridge and break the color accessor
+        map_data['color'] = colors.tolist()
+        map_data['radius'] = map_data['estimated_co2_kg_hr'].to_numpy() / 500 + 5000
+
+        # Pre-render the tooltip HTML per row (vectorized string ops) so
+        # deck.gl substitutes one field on hover instead of formatting
+        # numbers in JS for every frame
+        map_data['tooltip_html'] = (
+            '<b>' + map_data['plant_name'].astype(str) + '</b><br/>'
+            'State: ' + map_data['state'].astype(str) + '<br/>'
+            'CO2: ' + map_data['estimated_co2_kg_hr'].round().astype(int).astype(str) + ' kg/hr<br/>'
+            'Enhancement: ' + map_data['enhancement_percent'].round(1).astype(str) + '%<br/>'
+            'Confidence: ' + map_data['detection_confidence'].astype(str)
+        )
+
+        layer = pdk.Layer(
+            "ScatterplotLayer",
+            data=map_data,
+            get_position=["longitude", "latitude"],
+            get_color="color",
+            get_radius="radius",
+            pickable=True,
+            opacity=0.8,
+            stroked=True,
+            filled=True,
+            radius_scale=6,
+            radius_min_pixels=5,
+            radius_max_pixels=50,
+        )
+
+    view_state = pdk.ViewState(latitude=22.5, longitude=82.0, zoom=4, pitch=45)
+
+    return pdk.Deck(
+        layers=[layer],
+        initial_view_state=view_state,
+        tooltip={"html": "{tooltip_html}"},
+        map_style="mapbox://styles/mapbox/dark-v10"
+    )
+
+@st.cache_resource
+def get_ai_agent():
+    """One ClimateIntelligence instance (and its HTTP client) per process."""
+    return ClimateIntelligence()
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS)
+def compute_aggregates(detections):
+    """Aggregate the filtered detections once; shared by metrics and charts."""
+    return {
+        'total_co2': float(detections['estimated_co2_kg_hr'].sum()),
+        'high_count': int((detections['detection_confidence'] == 'HIGH').sum()),
+        'top10': detections.nlargest(10, 'estimated_co2_kg_hr'),
+        'state_emissions': (
+            detections.groupby('state', observed=True)['estimated_co2_kg_hr']
+            .sum()
+            .reset_index()
+        ),
+    }
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS)
+def build_top10_figure(top10):
+    """Top-emitters bar chart built from raw arrays (skips px inference)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Bar(
+        x=top10['plant_name'].to_numpy(),
+        y=top10['estimated_co2_kg_hr'].to_numpy(),
+        marker_color=[CONF_COLORS.get(c, '#05ffa1') for c in top10['detection_confidence']],
+    ))
+    fig.update_layout(
+        template="plotly_dark",
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis_title="plant_name",
+        yaxis_title="estimated_co2_kg_hr",
+    )
+    return fig
+
+@st.cache_data(hash_funcs=_DF_HASH_FUNCS)
+def to_detection_records(detections):
+    """Convert detections to a list of dicts once per unique DataFrame."""
+    try:
+        # Arrow path skips the pandas to_dict intermediate
+        import pyarrow as pa
+        return pa.Table.from_pandas(detections, preserve_index=False).to_pylist()
+    except Exception:
+        return detections.to_dict('records')
+
 def render_globe():
-    """Renders the 3D Globe visualization."""
-    globe_html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style> body { margin: 0; background-color: #020203; } </style>
-        <script src="//unpkg.com/globe.gl"></script>
-    </head>
-    <body>
-    <div id="globeViz"></div>
-    <script>
-        const N = 40;
-        const gData = [...Array(N).keys()].map(() => ({
-            lat: (Math.random() - 0.5) * 180,
-            lng: (Math.random() - 0.5) * 360,
-            size: Math.random() / 3,
-            color: ['#ff2a6d', '#00f2ff', '#05ffa1'][Math.round(Math.random() * 2)]
-        }));
-
-        Globe()
-        .globeImageUrl('//unpkg.com/three-globe/example/img/earth-night.jpg')
-        .pointsData(gData)
-        .pointAltitude('size')
-        .pointColor('color')
-        .pointRadius(0.5)
-        .atmosphereColor('#00f2ff')
-        .atmosphereAltitude(0.15)
-        (document.getElementById('globeViz'));
-    </script>
-    </body>
-    </html>
+    """Renders the 3D Globe visualization.
+
+    The page lives in static/globe.html (served via enableStaticServing),
+    so the browser caches both the document and the CDN script across
+    reruns instead of re-parsing an inlined srcdoc blob each time.
     """
-    components.html(globe_html, height=500)
+    components.iframe("app/static/globe.html", height=500)
+
+def _stream_cached(key, make_stream):
+    """Stream an AI answer once per unique input, replaying it thereafter.
+
+    st.write_stream returns the concatenated text, which we keep in
+    session state keyed on (report kind, data hash, params); a re-click
+    with unchanged inputs renders instantly instead of re-hitting the
+    LLM. st.cache_data cannot hold this because the value starts life as
+    a generator.
+    """
+    cache = st.session_state.setdefault('_ai_outputs', {})
+    if key in cache:
+        st.markdown(cache[key])
+    else:
+        cache[key] = st.write_stream(make_stream())
+
+def _ai_detection_records(filtered_detections):
+    """Derived columns + record conversion for the AI prompts (cached)."""
+    ai_frame = filtered_detections.assign(
+        co2_tonnes_day=filtered_detections['estimated_co2_tons_day'].fillna(0),
+        confidence=filtered_detections['detection_confidence'].fillna('MEDIUM'),
+        detection_date=datetime.now().strftime('%Y-%m-%d'),
+    )
+    return to_detection_records(ai_frame)
+
+# Fragments: widget interactions inside a tab re-run only that function,
+# not the whole of main() (sidebar widgets still trigger a full rerun)
+
+@st.fragment
+def render_map(filtered_detections, map_layer):
+    st.markdown("### 📍 THERMAL ANOMALY MAP")
+
+    # Cheap content fingerprint so unchanged data reuses the cached Deck
+    data_key = _hash_df(filtered_detections)
+    st.pydeck_chart(build_deck(data_key, filtered_detections, map_layer))
+
+@st.fragment
+def render_charts(aggregates):
+    import plotly.express as px
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.markdown("### 🏭 EMISSIONS BY FACILITY")
+        st.plotly_chart(build_top10_figure(aggregates['top10']), use_container_width=True)
+
+    with c2:
+        st.markdown("### 🗺️ REGIONAL DISTRIBUTION")
+        state_emissions = aggregates['state_emissions']
+        fig_pie = px.pie(
+            state_emissions,
+            names='state',
+            values='estimated_co2_kg_hr',
+            color_discrete_sequence=['#00f2ff', '#ff2a6d', '#05ffa1', '#8892b0'],
+            template="plotly_dark",
+            hole=0.4
+        )
+        fig_pie.update_layout(paper_bgcolor="rgba(0,0,0,0)")
+        st.plotly_chart(fig_pie, use_container_width=True)
+
+@st.fragment
+def render_ai_section(filtered_detections):
+    st.markdown("### 🧠 AI GENERATED INSIGHTS")
+
+    # Initialize AI (cached singleton, keeps the Groq session alive)
+    ai_agent = get_ai_agent()
+
+    if not ai_agent.is_available:
+        st.warning("⚠️ AI running in Demo Mode. Set GROQ_API_KEY for live analysis.")
+
+    detection_list = _ai_detection_records(filtered_detections)
+    data_key = _hash_df(filtered_detections)
+
+    ai_tabs = st.tabs(["📝 SUMMARY", "⚖️ COMPLIANCE", "🌿 ESG REPORT", "📜 DRAFT COMPLAINT", "💰 CARBON CREDITS"])
+
+    with ai_tabs[0]:
+        if st.button("🔍 GENERATE SUMMARY", key="ai_sum_btn"):
+            _stream_cached(('summary', data_key),
+                           lambda: ai_agent.stream_summary(detection_list))
+        else:
+            st.info("Click to generate executive summary based on current data.")
+
+    with ai_tabs[1]:
+        plant_opts = ["All Plants"] + list(filtered_detections['plant_name'].unique())
+        sel_plant = st.selectbox("Select Facility", plant_opts)
+        if st.button("📜 CHECK COMPLIANCE", key="ai_comp_btn"):
+            p_filter = None if sel_plant == "All Plants" else sel_plant
+            _stream_cached(('compliance', data_key, p_filter),
+                           lambda: ai_agent.stream_compliance(detection_list, p_filter))
+
+    with ai_tabs[2]:
+        if st.button("📊 GENERATE ESG REPORT", key="ai_esg_btn"):
+            _stream_cached(('esg', data_key),
+                           lambda: ai_agent.stream_esg_report(detection_list, "Indian Thermal Power Portfolio"))
+
+    with ai_tabs[3]:
+        target = st.selectbox("Target Facility", list(filtered_detections['plant_name'].unique()))
+        if st.button("📝 DRAFT COMPLAINT", key="ai_cpcb_btn"):
+            _stream_cached(('complaint', data_key, target),
+                           lambda: ai_agent.stream_cpcb_complaint(detection_list, target, "CO2Watch India"))
+
+    with ai_tabs[4]:
+        if st.button("💰 ANALYZE CARBON CREDITS", key="ai_carbon_btn"):
+            _stream_cached(('carbon', data_key),
+                           lambda: ai_agent.stream_carbon_credits(detection_list))
+
+@st.fragment
+def render_ask_ai(filtered_detections):
+    st.markdown("### 💬 ASK AI ANYTHING")
+    custom_query = st.text_area("Ask a question about the emission data:", placeholder="e.g., Which plants need immediate FGD installation?")
+    if st.button("🚀 ASK AI", key="ai_custom_btn") and custom_query:
+        cache = st.session_state.setdefault('_ai_outputs', {})
+        key = ('custom', _hash_df(filtered_detections), custom_query)
+        if key not in cache:
+            detection_list = _ai_detection_records(filtered_detections)
+            with st.spinner("Thinking..."):
+                cache[key] = get_ai_agent().custom_query(detection_list, custom_query)
+        st.markdown(cache[key])
 
 # -----------------------------------------------------------------------------
 # 3. MAIN APPLICATION
@@ -375,6 +610,9 @@ def main():
         show_high = st.checkbox("High Confidence", value=True)
         show_medium = st.checkbox("Medium Confidence", value=True)
         show_low = st.checkbox("Low Confidence", value=False)
+
+        st.markdown("### 🗺️ MAP LAYER")
+        map_layer = st.radio("Rendering", ["Scatterplot", "Heatmap"], horizontal=True)
         
         st.markdown("---")
         if st.button("🔄 REFRESH DATA"):
@@ -395,9 +633,9 @@ def main():
             if st.button("VIEW LIVE DASHBOARD"):
                 st.session_state.use_live_data = True
                 st.rerun()
-        
+
         st.markdown('</div>', unsafe_allow_html=True)
-        
+
         # Feature Highlights
         c1, c2, c3 = st.columns(3)
         with c1:
@@ -440,182 +678,59 @@ def main():
         # Load & Filter Data
         detections = load_data()
         
-        # Apply filters
-        conf_filter = {'HIGH': show_high, 'MEDIUM': show_medium, 'LOW': show_low}
-        filtered_detections = detections[
-            detections['detection_confidence'].apply(lambda x: conf_filter.get(x, True))
-        ]
+        # Apply filters (vectorized isin instead of a per-row lambda)
+        enabled = {level for level, on in
+                   (('HIGH', show_high), ('MEDIUM', show_medium), ('LOW', show_low)) if on}
+        filtered_detections = detections[detections['detection_confidence'].isin(enabled)]
+        aggregates = compute_aggregates(filtered_detections)
 
         # Metrics Row
         m1, m2, m3, m4 = st.columns(4)
         with m1:
             st.metric("Active Hotspots", f"{len(filtered_detections)}", "+12%")
         with m2:
-            total_co2 = filtered_detections['estimated_co2_kg_hr'].sum()
-            st.metric("Total Emissions", f"{total_co2/1000:,.1f} t/hr", "+5.4%")
+            st.metric("Total Emissions", f"{aggregates['total_co2']/1000:,.1f} t/hr", "+5.4%")
         with m3:
-            high_count = len(filtered_detections[filtered_detections['detection_confidence'] == 'HIGH'])
-            st.metric("Critical Alerts", f"{high_count}", "High Priority")
+            st.metric("Critical Alerts", f"{aggregates['high_count']}", "High Priority")
         with m4:
             st.metric("Data Freshness", "Live", "2s ago")
 
-        # Main Content Tabs
-        tab1, tab2, tab3, tab4, tab5 = st.tabs(["🗺️ GEOSPATIAL", "📊 ANALYTICS", "🤖 AI INTELLIGENCE", "📋 RAW DATA", "💬 ASK AI"])
-
-        # TAB 1: GEOSPATIAL
-        with tab1:
-            st.markdown("### 📍 THERMAL ANOMALY MAP")
-            
-            # Prepare map data
-            map_data = filtered_detections.copy()
-            def get_color(row):
-                if row['detection_confidence'] == 'HIGH': return [255, 42, 109, 200] # Neon Red
-                elif row['detection_confidence'] == 'MEDIUM': return [0, 242, 255, 180] # Neon Cyan
-                else: return [5, 255, 161, 150] # Neon Green
-            
-            map_data['color'] = map_data.apply(get_color, axis=1)
-            map_data['radius'] = map_data['estimated_co2_kg_hr'] / 500 + 5000
-
-            layer = pdk.Layer(
-                "ScatterplotLayer",
-                data=map_data,
-                get_position=["longitude", "latitude"],
-                get_color="color",
-                get_radius="radius",
-                pickable=True,
-                opacity=0.8,
-                stroked=True,
-                filled=True,
-                radius_scale=6,
-                radius_min_pixels=5,
-                radius_max_pixels=50,
-            )
-
-            view_state = pdk.ViewState(latitude=22.5, longitude=82.0, zoom=4, pitch=45)
-
-            r = pdk.Deck(
-                layers=[layer],
-                initial_view_state=view_state,
-                tooltip={"html": "<b>{plant_name}</b><br/>CO2: {estimated_co2_kg_hr} kg/hr<br/>Confidence: {detection_confidence}"},
-                map_style="mapbox://styles/mapbox/dark-v10"
-            )
-            st.pydeck_chart(r)
-
-        # TAB 2: ANALYTICS
-        with tab2:
-            c1, c2 = st.columns(2)
-            with c1:
-                st.markdown("### 🏭 EMISSIONS BY FACILITY")
-                fig_bar = px.bar(
-                    filtered_detections.nlargest(10, 'estimated_co2_kg_hr'),
-                    x='plant_name',
-                    y='estimated_co2_kg_hr',
-                    color='detection_confidence',
-                    color_discrete_map={'HIGH': '#ff2a6d', 'MEDIUM': '#00f2ff', 'LOW': '#05ffa1'},
-                    template="plotly_dark"
-                )
-                fig_bar.update_layout(paper_bgcolor="rgba(0,0,0,0)", plot_bgcolor="rgba(0,0,0,0)")
-                st.plotly_chart(fig_bar, use_container_width=True)
-            
-            with c2:
-                st.markdown("### 🗺️ REGIONAL DISTRIBUTION")
-                state_emissions = filtered_detections.groupby('state')['estimated_co2_kg_hr'].sum().reset_index()
-                fig_pie = px.pie(
-                    state_emissions,
-                    names='state',
-                    values='estimated_co2_kg_hr',
-                    color_discrete_sequence=['#00f2ff', '#ff2a6d', '#05ffa1', '#8892b0'],
-                    template="plotly_dark",
-                    hole=0.4
-                )
-                fig_pie.update_layout(paper_bgcolor="rgba(0,0,0,0)")
-                st.plotly_chart(fig_pie, use_container_width=True)
-
-        # TAB 3: AI INTELLIGENCE
-        with tab3:
-            st.markdown("### 🧠 AI GENERATED INSIGHTS")
-            
-            # Initialize AI
-            ai_agent = ClimateIntelligence()
-            
-            if not ai_agent.is_available:
-                st.warning("⚠️ AI running in Demo Mode. Set GROQ_API_KEY for live analysis.")
-
-            # Prepare data for AI
-            detection_list = filtered_detections.to_dict('records')
-            for d in detection_list:
-                d['co2_tonnes_day'] = d.get('estimated_co2_tons_day', 0)
-                d['confidence'] = d.get('detection_confidence', 'MEDIUM')
-                d['detection_date'] = datetime.now().strftime('%Y-%m-%d')
-
-            ai_tabs = st.tabs(["📝 SUMMARY", "⚖️ COMPLIANCE", "🌿 ESG REPORT", "📜 DRAFT COMPLAINT", "💰 CARBON CREDITS"])
-            
-            with ai_tabs[0]:
-                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-                if st.button("🔍 GENERATE SUMMARY", key="ai_sum_btn"):
-                    with st.spinner("Analyzing..."):
-                        st.markdown(ai_agent.get_summary(detection_list))
-                else:
-                    st.info("Click to generate executive summary based on current data.")
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with ai_tabs[1]:
-                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-                plant_opts = ["All Plants"] + list(filtered_detections['plant_name'].unique())
-                sel_plant = st.selectbox("Select Facility", plant_opts)
-                if st.button("📜 CHECK COMPLIANCE", key="ai_comp_btn"):
-                    with st.spinner("Auditing..."):
-                        p_filter = None if sel_plant == "All Plants" else sel_plant
-                        st.markdown(ai_agent.analyze_compliance(detection_list, p_filter))
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-            with ai_tabs[2]:
-                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-                if st.button("📊 GENERATE ESG REPORT", key="ai_esg_btn"):
-                    with st.spinner("Generating..."):
-                        st.markdown(ai_agent.generate_esg_report(detection_list, "Indian Thermal Power Portfolio"))
-                st.markdown('</div>', unsafe_allow_html=True)
-                
-            with ai_tabs[3]:
-                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-                target = st.selectbox("Target Facility", list(filtered_detections['plant_name'].unique()))
-                if st.button("📝 DRAFT COMPLAINT", key="ai_cpcb_btn"):
-                    with st.spinner("Drafting..."):
-                        st.markdown(ai_agent.draft_cpcb_complaint(detection_list, target, "CO2Watch India"))
-                st.markdown('</div>', unsafe_allow_html=True)
-
-            with ai_tabs[4]:
-                st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-                if st.button("💰 ANALYZE CARBON CREDITS", key="ai_carbon_btn"):
-                    with st.spinner("Calculating..."):
-                        st.markdown(ai_agent.estimate_carbon_credits(detection_list))
-                st.markdown('</div>', unsafe_allow_html=True)
-
-        # TAB 4: RAW DATA
-        with tab4:
+        # Main content views: a radio dispatch instead of st.tabs, so only
+        # the selected view's body runs per rerun — st.tabs executes every
+        # tab's Python (Deck build, figure serialization) even when hidden
+        view = st.radio(
+            "View",
+            ["🗺️ GEOSPATIAL", "📊 ANALYTICS", "🤖 AI INTELLIGENCE", "📋 RAW DATA", "💬 ASK AI"],
+            horizontal=True,
+            label_visibility="collapsed",
+            key="active_view",
+        )
+
+        if view == "🗺️ GEOSPATIAL":
+            render_map(filtered_detections, map_layer)
+        elif view == "📊 ANALYTICS":
+            render_charts(aggregates)
+        elif view == "🤖 AI INTELLIGENCE":
+            render_ai_section(filtered_detections)
+        elif view == "📋 RAW DATA":
             st.markdown("### 📋 DETECTED SOURCES")
-            
-            # Styling for dataframe
-            def highlight_conf(val):
-                if val == 'HIGH': return 'color: #ff2a6d; font-weight: bold'
-                elif val == 'MEDIUM': return 'color: #00f2ff'
-                return 'color: #05ffa1'
 
+            # Plain dataframe + column_config: per-cell CSS styling makes
+            # Streamlit's renderer crawl, native number formatting doesn't
             st.dataframe(
-                filtered_detections.style.applymap(highlight_conf, subset=['detection_confidence']),
+                filtered_detections,
                 use_container_width=True,
-                height=500
+                height=500,
+                column_config={
+                    'estimated_co2_kg_hr': st.column_config.NumberColumn("CO₂ (kg/hr)", format="%,.0f"),
+                    'estimated_co2_tons_day': st.column_config.NumberColumn("CO₂ (tons/day)", format="%,.1f"),
+                    'capacity_mw': st.column_config.NumberColumn("Capacity (MW)", format="%,.0f"),
+                    'enhancement_percent': st.column_config.NumberColumn("Enhancement (%)", format="%.1f"),
+                    'detection_confidence': st.column_config.TextColumn("Confidence"),
+                },
             )
-
-        # TAB 5: ASK AI
-        with tab5:
-            st.markdown("### 💬 ASK AI ANYTHING")
-            st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-            custom_query = st.text_area("Ask a question about the emission data:", placeholder="e.g., Which plants need immediate FGD installation?")
-            if st.button("🚀 ASK AI", key="ai_custom_btn") and custom_query:
-                with st.spinner("Thinking..."):
-                    st.markdown(ai_agent.custom_query(detection_list, custom_query))
-            st.markdown('</div>', unsafe_allow_html=True)
+        else:
+            render_ask_ai(filtered_detections)
 
 if __name__ == "__main__":
     main()
@@ -235,7 +235,44 @@ Be brief but impactful. Use data-driven insights."""
                 return response.choices[0].message.content
             except Exception as e2:
                 return f"⚠️ AI analysis unavailable: {str(e2)}"
-    
+
+    def _call_llm_stream(self, system_prompt: str, user_content: str, max_tokens: int = 2000):
+        """
+        Stream a Groq LLM response token-by-token (SSE).
+
+        Args:
+            system_prompt: System instructions
+            user_content: User query/data
+            max_tokens: Maximum response tokens
+
+        Yields:
+            Response text fragments as they arrive. Falls back to a single
+            chunk (demo response or non-streaming call) when streaming is
+            not possible.
+        """
+        if not self.is_available:
+            yield self._get_demo_response(system_prompt)
+            return
+
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content}
+                ],
+                max_tokens=max_tokens,
+                temperature=0.3,
+                stream=True
+            )
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+        except Exception:
+            # Fall back to the blocking path (which handles the backup model)
+            yield self._call_llm(system_prompt, user_content, max_tokens)
+
     def _get_demo_response(self, prompt_type: str) -> str:
         """Generate demo response when API is not available."""
         demo_responses = {
@@ -376,56 +413,77 @@ Deploy mobile CEMS verification within 7 days
         
         return demo_responses["summary"]
     
-    def analyze_compliance(self, detections: List[Dict], 
+    def _compliance_query(self, detections: List[Dict],
+                          plant_name: Optional[str] = None) -> str:
+        """Build the user query for compliance analysis."""
+        data = self._format_detection_data(detections)
+
+        return f"""Analyze the following satellite-detected emission data for compliance with Indian regulations:
+
+{data}
+
+{"Focus specifically on: " + plant_name if plant_name else "Analyze all plants in the dataset."}
+
+Provide a detailed compliance assessment."""
+
+    def analyze_compliance(self, detections: List[Dict],
                           plant_name: Optional[str] = None) -> str:
         """
         Analyze emission data against Indian regulatory requirements.
-        
+
         Args:
             detections: List of detection dictionaries
             plant_name: Optional specific plant to analyze
-            
+
         Returns:
             Compliance analysis report
         """
+        return self._call_llm(self.PROMPTS["compliance"],
+                              self._compliance_query(detections, plant_name))
+
+    def stream_compliance(self, detections: List[Dict],
+                          plant_name: Optional[str] = None):
+        """Streaming variant of analyze_compliance; yields text chunks."""
+        return self._call_llm_stream(self.PROMPTS["compliance"],
+                                     self._compliance_query(detections, plant_name))
+
+    def _esg_query(self, detections: List[Dict], company_name: str) -> str:
+        """Build the user query for ESG report generation."""
         data = self._format_detection_data(detections)
-        
-        query = f"""Analyze the following satellite-detected emission data for compliance with Indian regulations:
+
+        return f"""Generate an ESG report section for {company_name} based on this satellite-verified emission data:
 
 {data}
 
-{"Focus specifically on: " + plant_name if plant_name else "Analyze all plants in the dataset."}
+The report should be suitable for:
+- Annual sustainability reports
+- Investor disclosures
+- TCFD-aligned reporting
+- BRSR (Business Responsibility and Sustainability Reporting) compliance"""
 
-Provide a detailed compliance assessment."""
-        
-        return self._call_llm(self.PROMPTS["compliance"], query)
-    
-    def generate_esg_report(self, detections: List[Dict], 
+    def generate_esg_report(self, detections: List[Dict],
                            company_name: str = "Power Generation Company") -> str:
         """
         Generate ESG report section based on emission data.
-        
+
         Args:
             detections: List of detection dictionaries
             company_name: Company name for the report
-            
+
         Returns:
             ESG report section
         """
-        data = self._format_detection_data(detections)
-        
-        query = f"""Generate an ESG report section for {company_name} based on this satellite-verified emission data:
+        return self._call_llm(self.PROMPTS["esg_report"],
+                              self._esg_query(detections, company_name),
+                              max_tokens=3000)
 
-{data}
+    def stream_esg_report(self, detections: List[Dict],
+                          company_name: str = "Power Generation Company"):
+        """Streaming variant of generate_esg_report; yields text chunks."""
+        return self._call_llm_stream(self.PROMPTS["esg_report"],
+                                     self._esg_query(detections, company_name),
+                                     max_tokens=3000)
 
-The report should be suitable for:
-- Annual sustainability reports
-- Investor disclosures
-- TCFD-aligned reporting
-- BRSR (Business Responsibility and Sustainability Reporting) compliance"""
-        
-        return self._call_llm(self.PROMPTS["esg_report"], query, max_tokens=3000)
-    
     def draft_cpcb_complaint(self, detections: List[Dict], 
                             target_plant: str,
                             complainant_name: str = "[Your Name]") -> str:
@@ -440,14 +498,22 @@ The report should be suitable for:
         Returns:
             Formal complaint letter draft
         """
+        return self._call_llm(self.PROMPTS["cpcb_complaint"],
+                              self._complaint_query(detections, target_plant, complainant_name),
+                              max_tokens=3000)
+
+    def _complaint_query(self, detections: List[Dict],
+                         target_plant: str,
+                         complainant_name: str) -> str:
+        """Build the user query for a CPCB complaint draft."""
         # Filter to specific plant
         plant_data = [d for d in detections if d.get('plant_name') == target_plant]
         if not plant_data:
             plant_data = detections[:1]  # Use first if not found
-        
+
         data = self._format_detection_data(plant_data)
-        
-        query = f"""Draft a formal CPCB complaint for:
+
+        return f"""Draft a formal CPCB complaint for:
 
 **Complainant:** {complainant_name}
 **Target Plant:** {target_plant}
@@ -456,9 +522,15 @@ The report should be suitable for:
 {data}
 
 Generate a complete, formal complaint letter ready for submission."""
-        
-        return self._call_llm(self.PROMPTS["cpcb_complaint"], query, max_tokens=3000)
-    
+
+    def stream_cpcb_complaint(self, detections: List[Dict],
+                              target_plant: str,
+                              complainant_name: str = "[Your Name]"):
+        """Streaming variant of draft_cpcb_complaint; yields text chunks."""
+        return self._call_llm_stream(self.PROMPTS["cpcb_complaint"],
+                                     self._complaint_query(detections, target_plant, complainant_name),
+                                     max_tokens=3000)
+
     def estimate_carbon_credits(self, detections: List[Dict]) -> str:
         """
         Estimate carbon credit potential under CCTS 2023.
@@ -469,9 +541,14 @@ Generate a complete, formal complaint letter ready for submission."""
         Returns:
             Carbon credit analysis
         """
+        return self._call_llm(self.PROMPTS["carbon_credit"],
+                              self._carbon_credit_query(detections))
+
+    def _carbon_credit_query(self, detections: List[Dict]) -> str:
+        """Build the user query for carbon credit analysis."""
         data = self._format_detection_data(detections)
-        
-        query = f"""Analyze carbon credit potential based on this emission data:
+
+        return f"""Analyze carbon credit potential based on this emission data:
 
 {data}
 
@@ -480,9 +557,12 @@ Consider:
 2. PAT Scheme ESCerts
 3. Article 6.4 mechanism potential
 4. Current carbon prices (India and international)"""
-        
-        return self._call_llm(self.PROMPTS["carbon_credit"], query)
-    
+
+    def stream_carbon_credits(self, detections: List[Dict]):
+        """Streaming variant of estimate_carbon_credits; yields text chunks."""
+        return self._call_llm_stream(self.PROMPTS["carbon_credit"],
+                                     self._carbon_credit_query(detections))
+
     def get_summary(self, detections: List[Dict]) -> str:
         """
         Get a quick summary of emission monitoring data.
@@ -493,16 +573,24 @@ Consider:
         Returns:
             Brief summary with key findings
         """
+        return self._call_llm(self.PROMPTS["summary"],
+                              self._summary_query(detections), max_tokens=500)
+
+    def _summary_query(self, detections: List[Dict]) -> str:
+        """Build the user query for an executive summary."""
         data = self._format_detection_data(detections)
-        
-        query = f"""Provide a brief executive summary of this emission monitoring data:
+
+        return f"""Provide a brief executive summary of this emission monitoring data:
 
 {data}
 
 Focus on actionable insights for decision-makers."""
-        
-        return self._call_llm(self.PROMPTS["summary"], query, max_tokens=500)
-    
+
+    def stream_summary(self, detections: List[Dict]):
+        """Streaming variant of get_summary; yields text chunks."""
+        return self._call_llm_stream(self.PROMPTS["summary"],
+                                     self._summary_query(detections), max_tokens=500)
+
     def custom_query(self, detections: List[Dict], question: str) -> str:
         """
         Answer a custom question about the emission data.
@@ -188,15 +188,16 @@ class TROPOMIFetcher:
         composite = self.get_no2_composite(start_date, end_date)
         
         observations = []
-        
-        for _, plant in plants_df.iterrows():
+        buffer_deg = buffer_km / 111
+
+        # itertuples: no per-row Series construction, attribute access only
+        for plant in plants_df.itertuples(index=False):
             # Create buffer geometry
-            buffer_deg = buffer_km / 111
             roi = ee.Geometry.Rectangle([
-                plant['longitude'] - buffer_deg,
-                plant['latitude'] - buffer_deg,
-                plant['longitude'] + buffer_deg,
-                plant['latitude'] + buffer_deg
+                plant.longitude - buffer_deg,
+                plant.latitude - buffer_deg,
+                plant.longitude + buffer_deg,
+                plant.latitude + buffer_deg
             ])
             
             # Extract statistics
@@ -212,11 +213,11 @@ class TROPOMIFetcher:
             ).getInfo()
             
             observations.append({
-                'plant_name': plant['name'],
-                'latitude': plant['latitude'],
-                'longitude': plant['longitude'],
-                'capacity_mw': plant.get('capacity_mw', None),
-                'state': plant.get('state', None),
+                'plant_name': plant.name,
+                'latitude': plant.latitude,
+                'longitude': plant.longitude,
+                'capacity_mw': getattr(plant, 'capacity_mw', None),
+                'state': getattr(plant, 'state', None),
                 'no2_mean_mol_m2': stats.get(f'{self.TROPO_NO2_BAND}_mean'),
                 'no2_std_mol_m2': stats.get(f'{self.TROPO_NO2_BAND}_stdDev'),
                 'no2_max_mol_m2': stats.get(f'{self.TROPO_NO2_BAND}_max'),
@@ -250,22 +250,24 @@ class PlumeDetector:
         """
         detections = []
         
-        for idx, plant in plants_df.iterrows():
-            print(f"🔍 Processing {plant['name']}...")
-            
+        # itertuples avoids boxing every cell into a Series the way
+        # iterrows does; attribute access replaces per-column dict lookups
+        for plant in plants_df.itertuples(index=False):
+            print(f"🔍 Processing {plant.name}...")
+
             result = self.detect_plume(
-                plant_lat=plant['latitude'],
-                plant_lon=plant['longitude'],
-                plant_name=plant['name'],
+                plant_lat=plant.latitude,
+                plant_lon=plant.longitude,
+                plant_name=plant.name,
                 start_date=start_date,
                 end_date=end_date,
-                capacity_mw=plant.get('capacity_mw'),
-                fuel_type=plant.get('fuel_type', 'coal').lower()
+                capacity_mw=getattr(plant, 'capacity_mw', None),
+                fuel_type=getattr(plant, 'fuel_type', 'coal').lower()
             )
-            
+
             if result:
-                result['state'] = plant.get('state')
-                result['operator'] = plant.get('operator')
+                result['state'] = getattr(plant, 'state', None)
+                result['operator'] = getattr(plant, 'operator', None)
                 detections.append(result)
         
         return pd.DataFrame(detections)
@@ -276,9 +278,9 @@ def _create_demo_detections(plants_df: pd.DataFrame) -> pd.DataFrame:
     Create realistic demo detection data for testing/presentation.
     Uses slight variations on base values to simulate realistic observations.
     """
-    np.random.seed(42)  # For reproducible demo data
-    
-    base_detections = [
+    rng = np.random.default_rng(42)  # For reproducible demo data
+
+    base = pd.DataFrame([
         {'name': 'Vindhyachal', 'base_co2': 97650, 'confidence': 'HIGH'},
         {'name': 'Mundra', 'base_co2': 73780, 'confidence': 'HIGH'},
         {'name': 'Sasan', 'base_co2': 60760, 'confidence': 'HIGH'},
@@ -289,39 +291,37 @@ def _create_demo_detections(plants_df: pd.DataFrame) -> pd.DataFrame:
         {'name': 'Anpara', 'base_co2': 28210, 'confidence': 'MEDIUM'},
         {'name': 'Korba', 'base_co2': 26040, 'confidence': 'MEDIUM'},
         {'name': 'Ramagundam', 'base_co2': 19530, 'confidence': 'LOW'},
-    ]
-    
-    detections = []
-    
-    for base_det in base_detections:
-        plant = plants_df[plants_df['name'] == base_det['name']].iloc[0]
-        
-        # Add realistic variation (±10%)
-        co2_var = base_det['base_co2'] * (1 + np.random.uniform(-0.1, 0.1))
-        enhancement = co2_var / 217 / 30  # Reverse calculate enhancement
-        
-        detection = {
-            'plant_name': base_det['name'],
-            'latitude': plant['latitude'],
-            'longitude': plant['longitude'],
-            'capacity_mw': plant['capacity_mw'],
-            'state': plant['state'],
-            'operator': plant['operator'],
-            'date_start': (datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d'),
-            'date_end': datetime.now().strftime('%Y-%m-%d'),
-            'plume_no2_mol_m2': 0.00015,
-            'background_no2_mol_m2': 0.00009,
-            'enhancement_mol_m2': enhancement,
-            'enhancement_percent': (enhancement / 0.00009) * 100,
-            'estimated_nox_kg_hr': co2_var / 217,
-            'estimated_co2_kg_hr': co2_var,
-            'estimated_co2_tons_day': co2_var * 24 / 1000,
-            'detection_confidence': base_det['confidence'],
-            'fuel_type': 'coal'
-        }
-        detections.append(detection)
-    
-    return pd.DataFrame(detections)
+    ])
+
+    # One merge instead of a plants_df scan per row
+    demo = base.merge(
+        plants_df[['name', 'latitude', 'longitude', 'capacity_mw', 'state', 'operator']],
+        on='name', how='left'
+    )
+
+    # Add realistic variation (±10%), drawn for all rows at once
+    co2_var = demo['base_co2'].to_numpy() * (1 + rng.uniform(-0.1, 0.1, len(demo)))
+    enhancement = co2_var / 217 / 30  # Reverse calculate enhancement
+
+    return pd.DataFrame({
+        'plant_name': demo['name'],
+        'latitude': demo['latitude'],
+        'longitude': demo['longitude'],
+        'capacity_mw': demo['capacity_mw'],
+        'state': demo['state'],
+        'operator': demo['operator'],
+        'date_start': (datetime.now() - timedelta(days=3)).strftime('%Y-%m-%d'),
+        'date_end': datetime.now().strftime('%Y-%m-%d'),
+        'plume_no2_mol_m2': 0.00015,
+        'background_no2_mol_m2': 0.00009,
+        'enhancement_mol_m2': enhancement,
+        'enhancement_percent': (enhancement / 0.00009) * 100,
+        'estimated_nox_kg_hr': co2_var / 217,
+        'estimated_co2_kg_hr': co2_var,
+        'estimated_co2_tons_day': co2_var * 24 / 1000,
+        'detection_confidence': demo['confidence'],
+        'fuel_type': 'coal'
+    })
 
 
 def run_detection(days_back: int = 3, use_demo: bool = False) -> pd.DataFrame: